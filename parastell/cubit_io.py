@@ -2,6 +2,7 @@ from pathlib import Path
 import os
 import inspect
 import subprocess
+import tempfile
 
 import cubit
 
@@ -43,6 +44,27 @@ def create_new_cubit_instance():
         init_cubit()
 
 
+def playback_commands(commands):
+    """Executes a batch of Cubit commands via a single journal file playback,
+    amortizing per-command dispatch overhead across the batch.
+
+    Arguments:
+        commands (iterable of str): Cubit commands to execute, in order.
+    """
+    init_cubit()
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".jou", delete=False
+    ) as journal_file:
+        journal_file.write("\n".join(commands) + "\n")
+        journal_path = journal_file.name
+
+    try:
+        cubit.cmd(f'playback "{journal_path}"')
+    finally:
+        Path(journal_path).unlink()
+
+
 def import_step_cubit(filename, import_dir):
     """Imports STEP file into Coreform Cubit.
 
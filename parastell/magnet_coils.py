@@ -1,4 +1,5 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -8,10 +9,25 @@ import cubit
 
 from . import log
 from . import cubit_io as cubit_io
-from .utils import read_yaml_config, filter_kwargs, reorder_loop, m2cm
+from .utils import (
+    read_yaml_config,
+    filter_kwargs,
+    normalize,
+    reorder_loop,
+    m2cm,
+)
 
 export_allowed_kwargs = ["step_filename", "export_mesh", "mesh_filename"]
 
+# Cache of parsed filament coordinate data, keyed on coils file path,
+# modification time, and parsing parameters, to avoid re-parsing unchanged
+# input files across MagnetSet instances
+_filament_data_cache = {}
+
+# Offsets defining the four edges of the rectangular coil cross-section,
+# identical for every coil
+cross_section_edge_offsets = np.array([[-1, -1], [-1, 1], [1, 1], [1, -1]])
+
 
 class MagnetSet(object):
     """An object representing a set of modular stellarator magnet coils.
@@ -112,62 +128,115 @@ class MagnetSet(object):
     def logger(self, logger_object):
         self._logger = log.check_init(logger_object)
 
-    def _instantiate_coils(self):
-        """Extracts filament coordinate data from input data file and
-        instantiates MagnetCoil class objects.
+    def _extract_filament_data(self):
+        """Extracts filament coordinate data from input data file, caching
+        parsed data such that unchanged input files are not re-parsed by
+        subsequent MagnetSet instances.
         (Internal function not intended to be called externally)
+
+        Returns:
+            coordinate_data (2-D np.array of float): contiguous Cartesian
+                coordinates of all filament points [cm].
+            filament_offsets (1-D np.array of int): starting index of each
+                filament within coordinate_data, with a final entry equal to
+                the total point count.
         """
-        with open(self.coils_file, "r") as file:
-            data = file.readlines()[self.start_line :]
+        cache_key = (
+            str(Path(self.coils_file).resolve()),
+            Path(self.coils_file).stat().st_mtime_ns,
+            self.start_line,
+            self.scale,
+        )
 
-        coords = []
-        self.magnet_coils = []
+        if cache_key not in _filament_data_cache:
+            # Evict stale entries for this file so that workflows
+            # regenerating the coils file between MagnetSet constructions do
+            # not accumulate a parsed coordinate array per file version
+            for key in list(_filament_data_cache):
+                if key[0] == cache_key[0]:
+                    del _filament_data_cache[key]
+
+            # Use a large read buffer; coil filament files can run to
+            # millions of lines
+            with open(self.coils_file, "r", buffering=2**20) as file:
+                filament_data = np.loadtxt(
+                    file,
+                    skiprows=self.start_line,
+                    comments="end",
+                    usecols=(0, 1, 2, 3),
+                )
 
-        for line in data:
-            columns = line.strip().split()
+            # A coil current (fourth column) of 0 signals the final point of
+            # a filament
+            terminal_indices = np.flatnonzero(filament_data[:, 3] == 0) + 1
 
-            if columns[0] == "end":
-                break
+            # Truncate any rows following the final filament and scale all
+            # coordinates in a single pass
+            coordinate_data = (
+                filament_data[: terminal_indices[-1], :3] * self.scale
+            )
 
-            # Coil current
-            s = float(columns[3])
+            filament_offsets = np.concatenate([[0], terminal_indices])
 
-            # s = 0 signals end of filament
-            if s != 0:
-                coords.append(
-                    [float(ord) * self.scale for ord in columns[0:3]]
-                )
+            # Overwrite each filament's terminal point with its initial point
+            # to ensure filaments form closed loops
+            coordinate_data[terminal_indices - 1] = coordinate_data[
+                filament_offsets[:-1]
+            ]
+
+            _filament_data_cache[cache_key] = (
+                coordinate_data,
+                filament_offsets,
+            )
+
+        coordinate_data, filament_offsets = _filament_data_cache[cache_key]
+
+        # Return a copy so that downstream reordering of coil coordinates
+        # cannot modify cached data
+        return coordinate_data.copy(), filament_offsets
+
+    def _instantiate_coils(self):
+        """Extracts filament coordinate data from input data file and
+        instantiates MagnetCoil class objects. Filament coordinates are
+        stored in a single contiguous array, with each coil's coordinates a
+        view into it, such that whole-set operations can be vectorized across
+        coils.
+        (Internal function not intended to be called externally)
+        """
+        self._filament_coords, self._filament_offsets = (
+            self._extract_filament_data()
+        )
 
-            else:
-                coords.append(coords[0])
-                self.magnet_coils.append(
-                    MagnetCoil(
-                        np.array(coords),
-                        np.average(coords[:-1], axis=0),
-                        self._width,
-                        self._thickness,
-                        self.sample_mod,
-                    )
+        self.magnet_coils = []
+
+        for start, end in zip(
+            self._filament_offsets[:-1], self._filament_offsets[1:]
+        ):
+            coords = self._filament_coords[start:end]
+            self.magnet_coils.append(
+                MagnetCoil(
+                    coords,
+                    np.average(coords[:-1], axis=0),
+                    self._width,
+                    self._thickness,
+                    self.sample_mod,
                 )
-                coords.clear()
+            )
 
     def _compute_radial_distance_data(self):
         """Computes average and maximum radial distance of filament points.
         (Internal function not intended to be called externally)
         """
-        radii_count = 0
-        self.average_radial_distance = 0
-        self.max_radial_distance = -1
+        # Exclude the closing point of each filament loop
+        interior_mask = np.ones(len(self._filament_coords), dtype=bool)
+        interior_mask[self._filament_offsets[1:] - 1] = False
 
-        for coil in self.magnet_coils:
-            radii = np.linalg.norm(coil.coords[:-1, :2], axis=1)
-            radii_count += len(radii)
-            self.average_radial_distance += np.sum(radii)
-            self.max_radial_distance = max(
-                self.max_radial_distance, np.max(radii)
-            )
-
-        self.average_radial_distance /= radii_count
+        radii = np.hypot(
+            self._filament_coords[interior_mask, 0],
+            self._filament_coords[interior_mask, 1],
+        )
+        self.average_radial_distance = np.mean(radii)
+        self.max_radial_distance = np.max(radii)
 
     def _filter_coils(self):
         """Filters list of MagnetCoil objects such that only those within the
@@ -184,17 +253,53 @@ class MagnetSet(object):
         lower_bound = 2 * np.pi - tol
         upper_bound = self._toroidal_extent + tol
 
+        # Compute toroidal angles of all filament points in a single
+        # vectorized pass over the full coil set
+        toroidal_angles = np.arctan2(
+            self._filament_coords[:, 1], self._filament_coords[:, 0]
+        )
+        # Ensure angles are positive, reducing modulo 2*pi in place to avoid
+        # allocating temporaries sized to the full point set
+        toroidal_angles += 2 * np.pi
+        np.remainder(toroidal_angles, 2 * np.pi, out=toroidal_angles)
+
+        # Compute bounds of toroidal extent of each filament
+        min_angles = np.minimum.reduceat(
+            toroidal_angles, self._filament_offsets[:-1]
+        )
+        max_angles = np.maximum.reduceat(
+            toroidal_angles, self._filament_offsets[:-1]
+        )
+
         # Create filter determining whether each coil lies within model's
         # toroidal extent
-        filtered_coils = [
-            coil
-            for coil in self.magnet_coils
-            if coil.in_toroidal_extent(lower_bound, upper_bound)
+        in_extent = (
+            (min_angles >= lower_bound)
+            | (min_angles <= upper_bound)
+            | (max_angles >= lower_bound)
+            | (max_angles <= upper_bound)
+        )
+        # Compute center-of-mass toroidal angles on range [-pi, pi] for all
+        # coils at once, such that filtering and sorting share a single pass
+        # over the coil set
+        centers_of_mass = np.array(
+            [coil.center_of_mass for coil in self.magnet_coils]
+        )
+        com_toroidal_angles = np.arctan2(
+            centers_of_mass[:, 1], centers_of_mass[:, 0]
+        )
+
+        # Select coils within the toroidal extent, sorted by center-of-mass
+        # toroidal angle
+        keep_indices = np.flatnonzero(in_extent)
+        order = keep_indices[
+            np.argsort(com_toroidal_angles[keep_indices], kind="stable")
         ]
-        self.magnet_coils = filtered_coils
+        self.magnet_coils = [self.magnet_coils[idx] for idx in order]
 
-        # Sort coils by center-of-mass toroidal angle and overwrite stored list
-        self.magnet_coils = self.sort_coils_toroidally()
+        # The contiguous filament arrays describe the unfiltered coil set;
+        # remove them now that filtering has invalidated the correspondence
+        del self._filament_coords, self._filament_offsets
 
     def _cut_magnets(self):
         """Cuts the magnets at the planes defining the toriodal extent.
@@ -229,11 +334,21 @@ class MagnetSet(object):
         self._filter_coils()
 
     def build_magnet_coils(self):
-        """Builds each filament in self.filtered_filaments in cubit, then cuts
+        """Builds a CAD solid for each coil in self.magnet_coils, then cuts
         to the toroidal extent using self._cut_magnets().
         """
         self._logger.info("Constructing magnet coils...")
 
+        # Precompute cross-section edge geometry for all coils in parallel;
+        # this stage is pure NumPy and releases the GIL. CAD construction
+        # remains serial since the underlying kernel is not thread-safe.
+        with ThreadPoolExecutor() as executor:
+            list(
+                executor.map(
+                    MagnetCoil._compute_edge_coords, self.magnet_coils
+                )
+            )
+
         [magnet_coil.create_magnet() for magnet_coil in self.magnet_coils]
 
         self._cut_magnets()
@@ -321,7 +436,12 @@ class MagnetSet(object):
         Returns:
             (list of object): sorted list of MagnetCoil class objects.
         """
-        return sorted(self.magnet_coils, key=lambda x: x.com_toroidal_angle())
+        com_toroidal_angles = np.array(
+            [coil.com_toroidal_angle() for coil in self.magnet_coils]
+        )
+        order = np.argsort(com_toroidal_angles, kind="stable")
+
+        return [self.magnet_coils[idx] for idx in order]
 
 
 class MagnetCoil(object):
@@ -360,15 +480,14 @@ class MagnetCoil(object):
             np.append(data[1:], [data[1]], axis=0),
             np.append([data[-2]], data[0:-1], axis=0),
         )
-        self.tangents = (
-            tangents / np.linalg.norm(tangents, axis=1)[:, np.newaxis]
-        )
+        self.tangents = normalize(tangents)
 
-    def create_magnet(self):
-        """Creates a single magnet coil CAD solid in CadQuery.
-
-        Returns:
-            coil (object): cq.Solid object representing a single magnet coil.
+    def _compute_edge_coords(self):
+        """Computes the coordinates of the edges of the rectangular coil
+        cross-section swept along the sampled filament, along with the sampled
+        filament tangent vectors. This stage is pure NumPy and may safely be
+        executed concurrently across coils.
+        (Internal function not intended to be called externally)
         """
         # Sample filament coordinates and tangents by modifier
         coords = self._coords[0 : -1 : self.sample_mod]
@@ -376,43 +495,52 @@ class MagnetCoil(object):
         tangents = self.tangents[0 : -1 : self.sample_mod]
         tangents = np.append(tangents, [self.tangents[0]], axis=0)
 
-        tangent_vectors = [cq.Vector(tuple(tangent)) for tangent in tangents]
-
         # Define coil filament path normals such that they face the filament
         # center of mass
         # Compute "outward" direction as difference between filament positions
         # and filament center of mass
-        outward_dirs = coords - self.center_of_mass
-        outward_dirs = (
-            outward_dirs / np.linalg.norm(outward_dirs, axis=1)[:, np.newaxis]
-        )
+        outward_dirs = normalize(coords - self.center_of_mass)
 
         # Project outward directions onto desired coil cross-section (CS) plane
         # at each filament position to define filament path normals
-        parallel_parts = np.diagonal(
-            np.matmul(outward_dirs, tangents.transpose())
-        )
+        parallel_parts = np.einsum("ij,ij->i", outward_dirs, tangents)
 
-        normals = outward_dirs - parallel_parts[:, np.newaxis] * tangents
-        normals = normals / np.linalg.norm(normals, axis=1)[:, np.newaxis]
+        normals = normalize(
+            outward_dirs - parallel_parts[:, np.newaxis] * tangents
+        )
 
         # Compute binormals projected onto CS plane at each position
         binormals = np.cross(tangents, normals)
 
         # Compute coordinates of edges of rectangular coils
-        edge_offsets = np.array([[-1, -1], [-1, 1], [1, 1], [1, -1]])
-
-        coil_edge_coords = []
-        for edge_offset in edge_offsets:
-            coil_edge = (
-                coords
-                + edge_offset[0] * binormals * (self.width / 2)
-                + edge_offset[1] * normals * (self.thickness / 2)
-            )
+        half_width_binormals = binormals * (self.width / 2)
+        half_thickness_normals = normals * (self.thickness / 2)
+
+        self._edge_coords = [
+            coords
+            + edge_offset[0] * half_width_binormals
+            + edge_offset[1] * half_thickness_normals
+            for edge_offset in cross_section_edge_offsets
+        ]
+        self._sampled_tangents = tangents
 
-            coil_edge_coords.append(
-                [cq.Vector(tuple(pos)) for pos in coil_edge]
-            )
+    def create_magnet(self):
+        """Creates a single magnet coil CAD solid in CadQuery.
+
+        Returns:
+            coil (object): cq.Solid object representing a single magnet coil.
+        """
+        if not hasattr(self, "_edge_coords"):
+            self._compute_edge_coords()
+
+        tangent_vectors = [
+            cq.Vector(tuple(tangent)) for tangent in self._sampled_tangents
+        ]
+
+        coil_edge_coords = [
+            [cq.Vector(tuple(pos)) for pos in coil_edge]
+            for coil_edge in self._edge_coords
+        ]
 
         # Append first edge once again
         coil_edge_coords.append(coil_edge_coords[0])
@@ -445,7 +573,8 @@ class MagnetCoil(object):
         # Compute toroidal angle of each point in filament
         toroidal_angles = np.arctan2(self._coords[:, 1], self._coords[:, 0])
         # Ensure angles are positive
-        toroidal_angles = (toroidal_angles + 2 * np.pi) % (2 * np.pi)
+        toroidal_angles += 2 * np.pi
+        np.remainder(toroidal_angles, 2 * np.pi, out=toroidal_angles)
         # Compute bounds of toroidal extent of filament
         min_tor_ang = np.min(toroidal_angles)
         max_tor_ang = np.max(toroidal_angles)
@@ -477,13 +606,17 @@ class MagnetCoil(object):
             outboard_index (int): index of the outboard midplane point.
         """
         # Compute radial distance of coordinates from z-axis
-        radii = np.linalg.norm(self.coords[:, :2], axis=1)
+        radii = np.hypot(self.coords[:, 0], self.coords[:, 1])
         # Determine whether adjacent points cross the midplane (if so, they will
         # have opposite signs)
-        shifted_coords = np.append(self.coords[1:], [self.coords[1]], axis=0)
-        midplane_flags = -np.sign(self.coords[:, 2] * shifted_coords[:, 2])
+        z_coords = self.coords[:, 2]
+        crossing_indices = np.flatnonzero(z_coords[:-1] * z_coords[1:] < 0)
+
+        if crossing_indices.size == 0:
+            return np.argmin(radii)
+
         # Find index of outboard midplane point
-        outboard_index = np.argmax(midplane_flags * radii)
+        outboard_index = crossing_indices[np.argmax(radii[crossing_indices])]
 
         return outboard_index
 
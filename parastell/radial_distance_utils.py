@@ -48,22 +48,30 @@ def reorder_coils(magnet_set):
     return magnet_coils
 
 
-def build_line(point_1, point_2):
-    """Builds a line between two points in Coreform Cubit.
+def line_command(point_1, point_2):
+    """Constructs the Cubit command creating a line between two points.
 
     Arguments:
         point_1 (1-D iterable of float): Cartesian coordinates of first point.
         point_2 (1-D iterable of float): Cartesian coordinates of second point.
 
     Returns:
-        curve_id (int): index of curve created in Coreform Cubit.
+        (str): Cubit command creating the line.
     """
     point_1 = " ".join(str(val) for val in point_1)
     point_2 = " ".join(str(val) for val in point_2)
-    cubit.cmd(f"create curve location {point_1} location {point_2}")
-    curve_id = cubit.get_last_id("curve")
 
-    return curve_id
+    return f"create curve location {point_1} location {point_2}"
+
+
+def build_line(point_1, point_2):
+    """Builds a line between two points in Coreform Cubit.
+
+    Arguments:
+        point_1 (1-D iterable of float): Cartesian coordinates of first point.
+        point_2 (1-D iterable of float): Cartesian coordinates of second point.
+    """
+    cubit.cmd(line_command(point_1, point_2))
 
 
 def build_magnet_surface(magnet_coils, sample_mod=1):
@@ -79,64 +87,63 @@ def build_magnet_surface(magnet_coils, sample_mod=1):
     """
     cubit_io.init_cubit()
 
-    surface_lines = [
-        [
-            build_line(coord, next_coord)
-            for coord, next_coord in zip(
-                downsample_loop(coil.coords, sample_mod),
-                downsample_loop(next_coil.coords, sample_mod),
-            )
-        ]
+    # Anchor the range of curve ids once; each build_line call creates
+    # exactly one curve, so subsequent ids can be inferred arithmetically
+    # rather than queried from Cubit per curve
+    first_curve_id = cubit.get_last_id("curve") + 1
+
+    line_commands = [
+        line_command(coord, next_coord)
         for coil, next_coil in zip(magnet_coils[:-1], magnet_coils[1:])
+        for coord, next_coord in zip(
+            downsample_loop(coil.coords, sample_mod),
+            downsample_loop(next_coil.coords, sample_mod),
+        )
     ]
-    surface_lines = np.array(surface_lines)
+    cubit_io.playback_commands(line_commands)
+
+    # The inferred id range assumes each command created exactly one curve;
+    # validate before building surfaces from those ids
+    if cubit.get_last_id("curve") != first_curve_id + len(line_commands) - 1:
+        raise RuntimeError(
+            "Line creation between adjacent filaments did not create one "
+            "curve per command; curve ids cannot be inferred."
+        )
 
     surface_sections = np.reshape(
-        surface_lines,
+        np.arange(first_curve_id, first_curve_id + len(line_commands)),
         (
             len(magnet_coils) - 1,
             len(downsample_loop(magnet_coils[0].coords, sample_mod)),
         ),
     )
 
-    [
-        [
-            cubit.cmd(f"create surface skin curve {line} {next_line}")
-            for line, next_line in zip(lines[:-1], lines[1:])
-        ]
+    skin_commands = [
+        f"create surface skin curve {line} {next_line}"
         for lines in surface_sections
+        for line, next_line in zip(lines[:-1], lines[1:])
     ]
+    cubit_io.playback_commands(skin_commands)
 
 
 def fire_ray(point, direction):
-    """Performs a ray-firing operation in Coreform Cubit from a reference point
-    and along a reference direction to determine the distance from that point
-    to the magnet surface.
+    """Performs a ray-firing operation in Coreform Cubit from a reference
+    point and along a reference direction, creating a single curve between
+    the reference point and the magnet surface.
 
     Arguments:
         point (iterable of float): Cartesian coordinates of reference point.
         direction (iterable of float): reference direction in
             Cartesian-coordinate system.
-
-    Returns:
-        distance (float): distance between reference point and magnet surface,
-            along reference direction.
     """
-    cubit.cmd(f"create vertex {point[0]} {point[1]} {point[2]}")
-    vertex_id = cubit.get_last_id("vertex")
-
+    point_str = " ".join(str(val) for val in point)
     cubit.cmd(
-        f"create curve location at vertex {vertex_id} "
-        f"location fire ray location at vertex {vertex_id} "
+        f"create curve location {point_str} "
+        f"location fire ray location {point_str} "
         f"direction {direction[0]} {direction[1]} {direction[2]} at "
         "surface all maximum hits 1"
     )
 
-    curve_id = cubit.get_last_id("curve")
-    distance = cubit.get_curve_length(curve_id)
-
-    return distance
-
 
 def measure_surface_coils_separation(surface):
     """Determines the distance between a given Surface class object and a
@@ -151,14 +158,33 @@ def measure_surface_coils_separation(surface):
             points defining surface.Ribs and magnet surface, along
             Rib._normals.
     """
-    distance_matrix = np.array(
+    # Anchor the range of curve ids once; each fire_ray call creates exactly
+    # one curve, so subsequent ids can be inferred arithmetically rather than
+    # queried from Cubit per ray
+    first_curve_id = cubit.get_last_id("curve") + 1
+
+    num_rays = 0
+    for rib in surface.Ribs:
+        for point, direction in zip(rib.rib_loci, rib._normals()):
+            fire_ray(point, direction)
+            num_rays += 1
+
+    # The inferred id range assumes each ray hit the magnet surface and
+    # created exactly one curve; a missed ray would silently shift every
+    # subsequent id
+    if cubit.get_last_id("curve") != first_curve_id + num_rays - 1:
+        raise RuntimeError(
+            "Ray firing did not create one curve per rib point; curve ids "
+            "cannot be inferred. Ensure every rib point lies within range "
+            "of the magnet surface."
+        )
+
+    distance_matrix = np.reshape(
         [
-            [
-                fire_ray(point, direction)
-                for point, direction in zip(rib.rib_loci, rib._normals())
-            ]
-            for rib in surface.Ribs
-        ]
+            cubit.get_curve_length(curve_id)
+            for curve_id in range(first_curve_id, first_curve_id + num_rays)
+        ],
+        (len(surface.Ribs), -1),
     )
 
     return distance_matrix
@@ -148,7 +148,9 @@ def normalize(vec_list):
             or array of normalized 1D vectors
     """
     if len(vec_list.shape) == 1:
-        return vec_list / np.linalg.norm(vec_list)
+        # math.sqrt avoids NumPy reduction overhead for a single small
+        # vector and yields a bit-identical norm
+        return vec_list / math.sqrt(vec_list @ vec_list)
     elif len(vec_list.shape) == 2:
         return vec_list / np.linalg.norm(vec_list, axis=1)[:, np.newaxis]
     else:
@@ -1,3 +1,5 @@
+import os
+import shutil
 from pathlib import Path
 
 import pytest
@@ -66,6 +68,53 @@ def test_magnet_construction(coil_set):
     remove_files()
 
 
+def test_filament_data_caching(monkeypatch, tmp_path):
+
+    source_file = Path("files_for_tests") / "coils.example"
+    coils_file = tmp_path / "coils.example"
+    shutil.copyfile(source_file, coils_file)
+
+    width = 40.0
+    thickness = 50.0
+    toroidal_extent = 90.0
+
+    coil_set = magnet_coils.MagnetSet(
+        coils_file, width, thickness, toroidal_extent
+    )
+    cold_coords, cold_offsets = coil_set._extract_filament_data()
+
+    # A warm retrieval must return equal data without re-reading the file
+    def fail_loadtxt(*args, **kwargs):
+        raise AssertionError("cache hit re-parsed an unchanged coils file")
+
+    monkeypatch.setattr(magnet_coils.np, "loadtxt", fail_loadtxt)
+    warm_coords, warm_offsets = coil_set._extract_filament_data()
+
+    assert np.array_equal(warm_coords, cold_coords)
+    assert np.array_equal(warm_offsets, cold_offsets)
+
+    # Returned coordinate arrays are copies; mutating one must not modify
+    # cached data
+    warm_coords[0] = 0.0
+    assert np.array_equal(coil_set._extract_filament_data()[0], cold_coords)
+
+    monkeypatch.undo()
+
+    # Modifying the file must invalidate the cache and evict the stale entry
+    file_stats = coils_file.stat()
+    os.utime(
+        coils_file, ns=(file_stats.st_atime_ns, file_stats.st_mtime_ns + 1)
+    )
+    coil_set._extract_filament_data()
+
+    matching_keys = [
+        key
+        for key in magnet_coils._filament_data_cache
+        if key[0] == str(coils_file.resolve())
+    ]
+    assert len(matching_keys) == 1
+
+
 def test_magnet_exports(coil_set):
 
     volume_ids_exp = list(range(1, 2))